@@ -1,5 +1,5 @@
 from django import forms
-from django.forms import inlineformset_factory
+from django.forms import BaseInlineFormSet, inlineformset_factory
 from django.utils import timezone
 from .models import Question, Choice
 
@@ -87,12 +87,51 @@ class ChoiceForm(forms.ModelForm):
         }
 
 
+class BaseChoiceFormSet(BaseInlineFormSet):
+    """
+    Formset de base pour les choix d'une question.
+
+    Restreint le queryset initial aux seules colonnes rendues par les
+    sous-formulaires (id et choice_text) : lors de l'édition d'une
+    question existante, la colonne votes n'est jamais affichée et n'a
+    donc pas besoin d'être rapatriée pour chaque ligne.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('queryset', Choice.objects.only('id', 'choice_text'))
+        super().__init__(*args, **kwargs)
+
+    def save_new_objects(self, commit=True):
+        """
+        Insère tous les nouveaux choix en une seule requête.
+
+        L'implémentation par défaut appelle `form.save()` sous-formulaire
+        par sous-formulaire, soit un INSERT par choix ; ici les instances
+        sont collectées en un passage (lignes vides ou supprimées exclues)
+        puis écrites via `bulk_create`.
+
+        :param commit (bool) : si True, enregistre les choix en base de données.
+        :return: Liste des instances Choice nouvellement créées
+        """
+        self.new_objects = [
+            Choice(question=self.instance,
+                   choice_text=form.cleaned_data['choice_text'])
+            for form in self.extra_forms
+            if form.has_changed() and not self._should_delete_form(form)
+        ]
+        if commit and self.new_objects:
+            Choice.objects.bulk_create(self.new_objects)
+        return self.new_objects
+
+
 # Création du formset pour gérer plusieurs choix liés à une question
 ChoiceFormSet = inlineformset_factory(
     # Modèle parent
     parent_model=Question,
     # Modèle enfant
     model=Choice,
+    # Formset de base avec queryset restreint
+    formset=BaseChoiceFormSet,
     # Formulaire à utiliser pour chaque enfant
     form=ChoiceForm,
     # Champs à afficher pour chaque enfant
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-08-30 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-pub_date'], name='polls_question_pub_date_desc'),
+        ),
+    ]
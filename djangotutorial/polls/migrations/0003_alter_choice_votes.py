@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-08-30 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0002_question_polls_question_pub_date_desc'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='choice',
+            name='votes',
+            field=models.IntegerField(db_default=0, default=0),
+        ),
+    ]
@@ -1,9 +1,11 @@
 import datetime
 import locale
+from operator import itemgetter
 
 from django.contrib import admin
 from django.db import models
-from django.db.models import Sum
+from django.db.models import ExpressionWrapper, F, FloatField, Sum, Value, Window
+from django.db.models.functions import Coalesce, NullIf
 from django.utils import timezone
 
 MAX_LENGTH = 20
@@ -14,12 +16,29 @@ def text_excerpt(text, max_length):
     Retourne un extrait du texte limité à `max_length` caractères.
 
     Si le texte dépasse la longueur maximale, ajoute '...' à la fin.
+    Le cas courant (texte court) retourne la chaîne telle quelle,
+    sans découpage ni concaténation.
 
     :param text: Texte original
     :param max_length: Nombre maximum de caractères
     :return: Texte tronqué si nécessaire
     """
-    return text[:max_length] + ('...' if len(text) > max_length else '')
+    return text if len(text) <= max_length else text[:max_length] + '...'
+
+
+def _set_french_locale():
+    """
+    Positionne la locale française pour le formatage des dates,
+    une seule fois par processus (l'appel système est coûteux et
+    `__str__` est invoqué pour chaque ligne des pages d'admin).
+    """
+    global _LOCALE_READY
+    if not _LOCALE_READY:
+        locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
+        _LOCALE_READY = True
+
+
+_LOCALE_READY = False
 
 
 class Question(models.Model):
@@ -35,15 +54,22 @@ class Question(models.Model):
     question_text = models.CharField(max_length=200)
     pub_date = models.DateTimeField("date published")
 
+    class Meta:
+        indexes = [
+            # Index descendant pour le tri order_by('-pub_date')[:5]
+            # de la page d'accueil : lecture d'index au lieu d'un tri complet
+            models.Index(fields=["-pub_date"], name="polls_question_pub_date_desc"),
+        ]
+
     def __str__(self):
         """
         Représentation texte de la question.
 
         Affiche la date de publication suivie d'un extrait du texte.
         """
-        locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
+        _set_french_locale()
         formatted_date = self.pub_date.strftime("%d %B %Y, %H:%M")
-        return "{} ({})".format(text_excerpt(self.question_text, MAX_LENGTH), formatted_date)
+        return f"{text_excerpt(self.question_text, MAX_LENGTH)} ({formatted_date})"
 
     @admin.display(
         boolean=True,
@@ -67,6 +93,53 @@ class Question(models.Model):
         """
         return timezone.now() - self.pub_date
 
+    def _get_cached_choices(self):
+        """
+        Retourne les choix annotés de leur pourcentage de votes.
+
+        Le pourcentage est calculé côté base via une fonction fenêtre
+        (somme des votes sur l'ensemble des choix de la question), ce qui
+        évite de rapatrier les lignes pour refaire le calcul en Python.
+        `NullIf` protège la division quand le total est nul et `Coalesce`
+        ramène alors le pourcentage à 0.
+
+        Si les choix ont déjà été chargés en masse via `prefetch_related`
+        (cas des vues de détail), les pourcentages sont calculés en un
+        seul passage sur les lignes en mémoire — inverse du total
+        précalculé pour remplacer la division par une multiplication —
+        au lieu d'émettre la requête fenêtrée.
+
+        Le résultat est mémorisé sur l'instance afin que les accès répétés
+        (ex : `get_choices` puis `get_max_choice` dans un même gabarit)
+        réutilisent la même liste au lieu de relancer une requête.
+
+        :return: Liste de tuples (choice_text, votes, pourcentage)
+        """
+        if not hasattr(self, '_choices_cache'):
+            prefetched = getattr(self, '_prefetched_objects_cache', {})
+            if 'choice_set' in prefetched:
+                choices = prefetched['choice_set']
+                total = sum(c.votes for c in choices)
+                scale = 100.0 / total if total else 0.0
+                self._choices_cache = [
+                    (c.choice_text, c.votes, c.votes * scale)
+                    for c in choices
+                ]
+                return self._choices_cache
+            self._choices_cache = list(
+                self.choice_set.annotate(
+                    pct=Coalesce(
+                        ExpressionWrapper(
+                            F('votes') * 100.0
+                            / NullIf(Window(expression=Sum('votes')), Value(0)),
+                            output_field=FloatField(),
+                        ),
+                        Value(0.0),
+                    )
+                ).values_list('choice_text', 'votes', 'pct')
+            )
+        return self._choices_cache
+
     def get_choices(self):
         """
         Retourne la liste des choix avec leurs statistiques.
@@ -78,32 +151,23 @@ class Question(models.Model):
 
         :return: Liste de tuples (choice_text, votes, pourcentage)
         """
-        resultat = self.choice_set.aggregate(total=Sum('votes'))
-        total = resultat['total']
-
-        if not total:
-            return [(c.choice_text, c.votes, 0) for c in self.choice_set.all()]
-
-        return [
-            (c.choice_text, c.votes, (c.votes / total) * 100)
-            for c in self.choice_set.all()
-        ]
+        return self._get_cached_choices()
 
     def get_max_choice(self):
         """
         Retourne le choix ayant le plus grand pourcentage de votes.
 
+        Réutilise la liste de choix déjà chargée par `get_choices`.
+
         :return: Tuple (texte_du_choix, pourcentage)
         """
-        choices = self.choice_set.all()
-        resultat = self.choice_set.aggregate(total=Sum('votes'))
-        total = resultat['total']
+        choices = self._get_cached_choices()
 
-        if not total:
+        if not choices or not any(votes for _, votes, _ in choices):
             return None, 0
 
-        max_choice = max(choices, key=lambda c: c.votes / total)
-        return max_choice.choice_text, max_choice.votes / total
+        choice_text, votes, pct = max(choices, key=itemgetter(1))
+        return choice_text, pct / 100
 
 
 class Choice(models.Model):
@@ -117,7 +181,10 @@ class Choice(models.Model):
 
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     choice_text = models.CharField(max_length=200)
-    votes = models.IntegerField(default=0)
+    # db_default déclare aussi la valeur par défaut côté base de données :
+    # un INSERT qui omet la colonne (script SQL, bulk chargé à la main)
+    # obtient 0 sans dépendre du défaut Python
+    votes = models.IntegerField(default=0, db_default=0)
 
     def __str__(self):
         """
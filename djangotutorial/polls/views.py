@@ -1,33 +1,19 @@
-from django.db.models import F, Sum
+from operator import attrgetter
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Sum
+from django.db.models.functions import Coalesce
 from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse
-from django.utils import timezone
 from django.views import generic
-import logging
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 from .forms import QuestionForm, ChoiceFormSet
 from .models import Choice, Question
 
-# pour garder une trace des erreurs dans les logs
-logger = logging.getLogger(__name__)
-
 URL_POLL_FORM = "polls/poll_form.html"
 
-"""
-def index(request):
-    latest_question_list = Question.objects.order_by("-pub_date")[:5]
-    context = {"latest_question_list": latest_question_list}
-    return render(request, "polls/index.html", context)
-
-def detail(request, question_id):
-    question = get_object_or_404(Question, pk=question_id)
-    return render(request, "polls/detail.html", {"question": question})
-
-def results(request, question_id):
-    question = get_object_or_404(Question, pk=question_id)
-    return render(request, "polls/results.html", {"question": question})
-"""
-
 
 class IndexView(generic.ListView):
     """
@@ -41,7 +27,10 @@ class IndexView(generic.ListView):
 
     def get_queryset(self):
         """ Retourne les cinq dernières questions publiées """
-        return Question.objects.order_by("-pub_date")[:5]
+        # Projection sur les seules colonnes affichées par le gabarit
+        return Question.objects.only(
+            "id", "question_text", "pub_date"
+        ).order_by("-pub_date")[:5]
 
 
 class AllView(generic.ListView):
@@ -55,7 +44,10 @@ class AllView(generic.ListView):
 
     def get_queryset(self):
         """Retourne toutes les questions triées par ID."""
-        return Question.objects.order_by("id")
+        # Projection sur les seules colonnes affichées par le gabarit
+        return Question.objects.only(
+            "id", "question_text", "pub_date"
+        ).order_by("id")
 
 
 class DetailView(generic.DetailView):
@@ -67,6 +59,10 @@ class DetailView(generic.DetailView):
     model = Question
     template_name = "polls/detail.html"
 
+    def get_queryset(self):
+        """Précharge les choix pour éviter une requête par accès au gabarit."""
+        return Question.objects.prefetch_related("choice_set")
+
 
 class ResultsView(generic.DetailView):
     """
@@ -75,6 +71,10 @@ class ResultsView(generic.DetailView):
     model = Question
     template_name = "polls/results.html"
 
+    def get_queryset(self):
+        """Précharge les choix pour éviter une requête par accès au gabarit."""
+        return Question.objects.prefetch_related("choice_set")
+
 
 class FrequencyView(generic.DetailView):
     """
@@ -83,6 +83,10 @@ class FrequencyView(generic.DetailView):
     model = Question
     template_name = "polls/frequency.html"
 
+    def get_queryset(self):
+        """Précharge les choix pour éviter une requête par accès au gabarit."""
+        return Question.objects.prefetch_related("choice_set")
+
 
 class StatisticsView(generic.ListView):
     """
@@ -90,6 +94,7 @@ class StatisticsView(generic.ListView):
 
     Cette vue calcule :
     - Le nombre total de questions, choix et votes.
+    - Le nombre de questions ayant reçu au moins un vote.
     - La moyenne de votes par question.
     - La question la plus populaire (best_question).
     - La question la moins populaire (worst_question).
@@ -98,8 +103,26 @@ class StatisticsView(generic.ListView):
     context_object_name = "question_list"
 
     def get_queryset(self):
-        """Retourne la liste des questions pour affichage détaillé."""
-        return Question.objects.order_by("id")
+        """
+        Retourne la liste des questions annotée avec leurs totaux.
+
+        Chaque question porte trois colonnes virtuelles :
+        - total_votes_count : somme des votes de ses choix
+        - choices_count : nombre de choix associés
+        - has_votes : présence d'au moins un vote (sous-requête EXISTS,
+          qui s'arrête à la première ligne trouvée)
+        """
+        return Question.objects.only(
+            "id", "question_text", "pub_date"
+        ).annotate(
+            total_votes_count=Coalesce(
+                Sum("choice__votes"), 0, output_field=IntegerField()
+            ),
+            choices_count=Count("choice"),
+            has_votes=Exists(
+                Choice.objects.filter(question=OuterRef("pk"), votes__gt=0)
+            ),
+        ).order_by("id")
 
     def get_context_data(self, **kwargs):
         """
@@ -107,25 +130,31 @@ class StatisticsView(generic.ListView):
         """
         context = super().get_context_data(**kwargs)
 
-        total_questions = Question.objects.count()
-        total_votes = Choice.objects.aggregate(Sum('votes'))['votes__sum'] or 0
-        total_choices = Choice.objects.count()
+        # Une seule évaluation du queryset annoté : tous les totaux
+        # se calculent ensuite en Python sur cette liste.
+        questions = list(context["question_list"])
+
+        total_questions = len(questions)
+        total_votes = sum(q.total_votes_count for q in questions)
+        total_choices = sum(q.choices_count for q in questions)
+        active_questions = sum(1 for q in questions if q.has_votes)
 
         # Calcul de la moyenne arithmétique de participation
         vote_average = (total_votes / total_questions) if total_questions > 0 else 0
 
-        # Identification des extrêmes via l'annotation (calcul par ligne)
-        # On ajoute une colonne virtuelle 'total_votes_count' pour trier les questions
-        best_question = Question.objects.annotate(
-            total_votes_count=Sum('choice__votes')
-        ).order_by('-total_votes_count').first()
-        worst_question = Question.objects.annotate(
-            total_votes_count=Sum('choice__votes')
-        ).order_by('-total_votes_count').last()
+        # Identification des extrêmes sur la liste déjà annotée :
+        # plus aucune requête supplémentaire pour best/worst
+        best_question = max(
+            questions, key=attrgetter('total_votes_count'), default=None
+        )
+        worst_question = min(
+            questions, key=attrgetter('total_votes_count'), default=None
+        )
 
-        last_question = Question.objects.order_by('id').last()
+        last_question = questions[-1] if questions else None
 
         context['choices_count'] = total_choices
+        context['active_questions_count'] = active_questions
         context['questions_count'] = total_questions
         context['votes_count'] = total_votes
         context['votes_average_by_question'] = vote_average
@@ -136,6 +165,7 @@ class StatisticsView(generic.ListView):
         return context
 
 
+@transaction.atomic
 def vote(request, question_id):
     """
     Gère la soumission d'un vote pour une question donnée.
@@ -150,8 +180,15 @@ def vote(request, question_id):
     """
     question = get_object_or_404(Question, pk=question_id)
     try:
-        selected_choice = question.choice_set.get(pk=request.POST["choice"])
-    except (KeyError, Choice.DoesNotExist):
+        # UPDATE direct en base (une seule colonne, pas de SELECT préalable),
+        # avec F() pour que l'incrément reste atomique
+        updated = question.choice_set.filter(pk=request.POST["choice"]).update(
+            votes=F("votes") + 1
+        )
+    except (KeyError, ValueError):
+        updated = 0
+
+    if not updated:
         # Ré-affiche le formulaire de vote avec un message d'erreur.
         return render(
             request,
@@ -161,15 +198,33 @@ def vote(request, question_id):
                 "error_message": "Vous n'avez pas sélectionner votre choix.",
             },
         )
-    else:
-        # Utilisation de F() pour demander à la base de données d'incrémenter
-        selected_choice.votes = F("votes") + 1
-        selected_choice.save()
 
-        # Redirection après succès POST pour éviter les doubles soumissions
-        return HttpResponseRedirect(reverse("polls:frequency", args=(question.id,)))
+    # Redirection après succès POST pour éviter les doubles soumissions
+    return HttpResponseRedirect(reverse("polls:frequency", args=(question.id,)))
+
+
+@cache_page(60 * 60)
+@vary_on_cookie
+def _poll_form(request):
+    """
+    Rend le formulaire de création vierge (chemin GET de `poll`).
+
+    Le formulaire vide est identique d'une requête à l'autre : la page
+    rendue est mise en cache une heure, ce qui évite de reconstruire le
+    formset (5 sous-formulaires) et de re-rendre le gabarit à chaque
+    affichage. `vary_on_cookie` isole le cache par session afin que le
+    jeton CSRF rendu corresponde toujours au cookie du visiteur.
+
+    :param request (HttpRequest) : Objet contenant la requête HTTP
+    :return : HttpResponse : rendu du formulaire vierge
+    """
+    return render(request, URL_POLL_FORM, {
+        "form": QuestionForm(),
+        "formset": ChoiceFormSet()
+    })
 
 
+@transaction.atomic
 def poll(request):
     """
     Vue pour créer une nouvelle question de sondage avec ses choix.
@@ -187,98 +242,53 @@ def poll(request):
                 - Redirige vers l'index des sondages
         - Si le formulaire Question n'est pas valide, on initialise un formset vide pour l'affichage.
     2. Si la requête est GET :
-        - Crée un formulaire QuestionForm vide
-        - Crée un ChoiceFormSet vide (avec les champs vides prédéfinis par extra)
+        - Délègue à `_poll_form`, qui sert le formulaire vierge depuis le cache
 
     :param request (HttpRequest) : Objet contenant la requête HTTP (GET ou POST)
     :return : HttpResponse : rendu du formulaire ou redirection vers l'index après succès
     """
 
+    # --- requête GET : formulaire vierge servi depuis le cache ---
+    if request.method != "POST":
+        return _poll_form(request)
+
     # --- requête POST ---
-    if request.method == "POST":
-        # Création du formulaire Question avec les données POST
-        form = QuestionForm(request.POST)
-        if form.is_valid():
-            # Crée un formset de Choice lié à l'instance Question (non encore sauvegardée)
-            formset = ChoiceFormSet(request.POST, instance=form.save(commit=False))
-
-            if formset.is_valid():
-                # Enregistrement de la question avec date actuelle
-                question = form.save(commit=False)
-                question.pub_date = timezone.now()
-                question.save()
-
-                # Lie le formset à la question sauvegardée
-                formset.instance = question
-                # Enregistre tous les choix du formset
-                formset.save()
-
-                # Redirection vers la page d'accueil des sondages
-                return redirect("polls:index")
-        else:
-            # Si QuestionForm invalide, on crée un formset vide pour affichage
-            formset = ChoiceFormSet()
-
-    # --- requête GET ---
+    # Rejet rapide d'une question vide : inutile de construire le
+    # formulaire lié (copie du POST + validateurs de champs) pour
+    # l'erreur de saisie la plus courante
+    if not request.POST.get("question_text", "").strip():
+        return render(request, URL_POLL_FORM, {
+            "form": QuestionForm(),
+            "formset": ChoiceFormSet(),
+            "error_message": "Vous devez saisir une question (obligatoire).",
+        })
+
+    # Création du formulaire Question avec les données POST
+    form = QuestionForm(request.POST)
+    if form.is_valid():
+        # Une seule construction de l'instance Question (pub_date incluse,
+        # voir QuestionForm.save) : le même objet sert d'instance au
+        # formset puis à l'enregistrement
+        question = form.save(commit=False)
+        formset = ChoiceFormSet(request.POST, instance=question)
+
+        if formset.is_valid():
+            # Enregistrement de la question (la vue entière est atomique,
+            # voir le décorateur)
+            question.save()
+
+            # BaseChoiceFormSet.save_new_objects insère tous les choix
+            # en une seule requête
+            formset.save()
+
+            # Redirection vers la page d'accueil des sondages
+            return redirect("polls:index")
     else:
-        # formulaire vide pour la question
-        form = QuestionForm()
-        # formset vide pour les choix
+        # Si QuestionForm invalide, on crée un formset vide pour affichage
         formset = ChoiceFormSet()
 
     # --- Rendu du template avec les formulaires ---
-    return render(request, "polls/poll_form.html", {
+    return render(request, URL_POLL_FORM, {
         "form": form,
         "formset": formset
     })
-
-
-"""
-def poll(request):
-    
-    Gère la création d'un sondage : affiche le formulaire (GET)
-    ou enregistre la question et redirige vers l'index (POST).
-
-    :param request: L'objet HttpRequest.
-    :return: HttpResponseRedirect vers l'index ou rendu du formulaire avec erreur.
-    
-
-    if request.method == "POST":
-        try:
-            # Récupération du formulaire
-            text = request.POST.get("question_text")
-            if not text or text.strip() == "":
-                raise ValueError("La question ne peut pas être vide.")
-
-            # Sauvegarde de la question
-            new_question = Question.objects.create(
-                question_text=text,
-                pub_date=timezone.now()
-            )
-
-            # Récupération et création des choix (non vides)
-            choices = request.POST.getlist("choice_text")
-            for choice_text in choices:
-                if choice_text.strip():
-                    new_question.choice_set.create(
-                        choice_text=choice_text,
-                        votes=0
-                    )
-
-            # Redirection
-            return redirect("polls:index")
-
-        except ValueError as e:
-            # Erreur de validation
-            return render(request, URL_POLL_FORM, {
-                "error_message": str(e)
-            })
-        except Exception as e:
-            # Erreur imprévue
-            logger.error(f"Erreur lors de la création du sondage : {e}")
-            return render(request, URL_POLL_FORM, {
-                "error_message": "Une erreur technique est survenue. Réessayez plus tard."
-            })
-
-    return render(request, URL_POLL_FORM, {"choice_range": range(1, 6)})
-"""